@@ -37,8 +37,8 @@ CALL_CANCELED_STATE = 'canceled'
 
 CALL_INCOMPLETE_STATES = (CALL_WAITING_STATE, CALL_ACCEPTED_STATE, CALL_RUNNING_STATE,
                           CALL_SUSPENDED_STATE)
-CALL_COMPLETE_STATES = (CALL_SKIPPED_STATE, CALL_FINISHED_STATE, CALL_ERROR_STATE,
-                        CALL_CANCELED_STATE)
+CALL_COMPLETE_STATES = frozenset((CALL_SKIPPED_STATE, CALL_FINISHED_STATE, CALL_ERROR_STATE,
+                                  CALL_CANCELED_STATE))
 CALL_STATES = (CALL_WAITING_STATE, CALL_SKIPPED_STATE, CALL_ACCEPTED_STATE, CALL_RUNNING_STATE,
                CALL_SUSPENDED_STATE, CALL_FINISHED_STATE, CALL_ERROR_STATE, CALL_CANCELED_STATE)
 
@@ -65,7 +65,8 @@ class ProfilerConduit(MultipleRepoUnitsMixin):
             unit_fields = list(unit_key_fields) + list(additional_unit_fields)
             criteria = UnitAssociationCriteria(association_fields=['unit_id'],
                                                unit_fields=unit_fields)
-            units = query_manager.get_units_by_type(repo_id, content_type_id, criteria)
+            units = query_manager.get_units_by_type(repo_id, content_type_id, criteria,
+                                                    as_generator=True)
 
             # Convert units to plugin units with unit_key and required metadata values for each unit
             all_units = []
@@ -6,7 +6,6 @@ import logging
 import os
 import signal
 import time
-import traceback
 import uuid
 
 from bson.json_util import dumps as bson_dumps
@@ -309,6 +308,8 @@ class TaskResult(object):
     each consumer when a repo distributor is updated.
     """
 
+    __slots__ = ('return_value', 'error', 'spawned_tasks')
+
     def __init__(self, result=None, error=None, spawned_tasks=None):
         """
         :param result: The return value from the task
@@ -500,7 +501,7 @@ class Task(PulpTask, ReservedTaskMixin):
         except DoesNotExist:
             task_status = None
         if task_status and task_status['state'] == constants.CALL_CANCELED_STATE:
-            _logger.debug("Task cancel received for task-id : [%s]" % self.request.id)
+            _logger.debug("Task cancel received for task-id : [%s]", self.request.id)
             return
         # Update start_time and set the task state to 'running' for asynchronous tasks.
         # Skip updating status for eagerly executed tasks, since we don't want to track
@@ -513,7 +514,7 @@ class Task(PulpTask, ReservedTaskMixin):
             TaskStatus.objects(task_id=self.request.id).update_one(
                 set__state=constants.CALL_RUNNING_STATE, set__start_time=start_time, upsert=True)
         # Run the actual task
-        _logger.debug("Running task : [%s]" % self.request.id)
+        _logger.debug("Running task : [%s]", self.request.id)
 
         if config.getboolean('profiling', 'enabled') is True:
             self.pr = cProfile.Profile()
@@ -533,7 +534,7 @@ class Task(PulpTask, ReservedTaskMixin):
         :param args:    Original arguments for the executed task.
         :param kwargs:  Original keyword arguments for the executed task.
         """
-        _logger.debug("Task successful : [%s]" % task_id)
+        _logger.debug("Task successful : [%s]", task_id)
         if kwargs.get('scheduled_call_id') is not None:
             if not isinstance(retval, AsyncResult):
                 _logger.info(_('resetting consecutive failure count for schedule %(id)s')
@@ -586,7 +587,7 @@ class Task(PulpTask, ReservedTaskMixin):
         if isinstance(exc, PulpCodedException):
             _logger.info(_('Task failed : [%(task_id)s] : %(msg)s') %
                          {'task_id': task_id, 'msg': str(exc)})
-            _logger.debug(traceback.format_exc())
+            _logger.debug(einfo.traceback)
         else:
             _logger.info(_('Task failed : [%s]') % task_id)
             # celery will log the traceback
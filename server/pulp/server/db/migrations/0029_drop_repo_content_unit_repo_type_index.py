@@ -0,0 +1,32 @@
+"""
+This migration drops the (repo_id, unit_type_id) search index from repo_content_units. It is a
+prefix of the (repo_id, unit_type_id, created) search index, which serves the same queries.
+"""
+import logging
+
+from pulp.server.db import connection
+
+_logger = logging.getLogger(__name__)
+
+INDEX_NAME = 'repo_id_-1_unit_type_id_-1'
+
+
+def migrate(*args, **kwargs):
+    """
+    Perform the migration as described in this module's docblock.
+
+    :param args:   unused
+    :type  args:   list
+    :param kwargs: unused
+    :type  kwargs: dict
+    """
+    db = connection.get_database()
+
+    # If 'repo_content_units' is not defined we don't need to do anything
+    if 'repo_content_units' not in db.collection_names():
+        return
+
+    collection = db['repo_content_units']
+    if INDEX_NAME in collection.index_information():
+        _logger.info("Dropping the repo_content_units index on repo_id and unit_type_id")
+        collection.drop_index(INDEX_NAME)
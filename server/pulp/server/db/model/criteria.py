@@ -3,6 +3,8 @@ import copy
 import re
 import sys
 
+from bson.errors import InvalidId
+from bson.objectid import ObjectId
 import pymongo
 
 from pulp.common.dateutils import parse_iso8601_datetime
@@ -10,6 +12,10 @@ from pulp.server import exceptions as pulp_exceptions
 from pulp.server.db.model.base import Model
 
 
+# The only association order that paging with start_after is consistent with.
+_START_AFTER_SORT = [('created', pymongo.ASCENDING), ('_id', pymongo.ASCENDING)]
+
+
 class Criteria(Model):
     def __init__(self, filters=None, sort=None, limit=None, skip=None, fields=None):
         super(Criteria, self).__init__()
@@ -101,7 +107,8 @@ class UnitAssociationCriteria(Model):
 
     def __init__(self, type_ids=None, association_filters=None, unit_filters=None,
                  association_sort=None, unit_sort=None, limit=None, skip=None,
-                 association_fields=None, unit_fields=None, remove_duplicates=False):
+                 association_fields=None, unit_fields=None, remove_duplicates=False,
+                 start_after=None):
         """
         There are a number of entry points into creating one of these instances:
         multiple REST interfaces, the plugins, etc. As such, this constructor
@@ -144,6 +151,18 @@ class UnitAssociationCriteria(Model):
         @param remove_duplicates: if True, units with multiple associations will
                only return a single association; defaults to False
         @type  remove_duplicates: bool
+
+        @param start_after: the "created" and "_id" values of the last unit
+               association of a previous page of results; if specified, only
+               associations ordered after it are returned. Paging this way
+               does not require the database to walk over the skipped
+               associations. Associations are ordered by "created" and "_id",
+               both ascending; association_sort must either be unspecified or
+               be exactly that order.
+        @type  start_after: dict
+
+        @raise pulp_exceptions.InvalidValue: if start_after is specified with
+               any other association_sort
         """
         super(UnitAssociationCriteria, self).__init__()
 
@@ -157,6 +176,15 @@ class UnitAssociationCriteria(Model):
         self.association_filters = association_filters or {}
         self.unit_filters = unit_filters or {}
 
+        if start_after is not None:
+            # Paging from an association is only meaningful in the order the
+            # associations are compared in; any other order would silently skip
+            # or repeat associations between pages.
+            if association_sort is None:
+                association_sort = list(_START_AFTER_SORT)
+            elif [tuple(entry) for entry in association_sort] != _START_AFTER_SORT:
+                raise pulp_exceptions.InvalidValue(['start_after'])
+
         self.association_sort = association_sort
         self.unit_sort = unit_sort
 
@@ -171,12 +199,22 @@ class UnitAssociationCriteria(Model):
                 association_fields.append('unit_id')
             if 'unit_type_id' not in association_fields:
                 association_fields.append('unit_type_id')
+            # The next page is requested using the created timestamp.
+            if start_after is not None and 'created' not in association_fields:
+                association_fields.append('created')
 
         self.association_fields = association_fields
         self.unit_fields = unit_fields
 
         self.remove_duplicates = remove_duplicates
 
+        if start_after is not None:
+            # The id is kept as a string so the criteria stays JSON serializable,
+            # as it is when passed as a task argument; it is only converted to an
+            # ObjectId when the query is built.
+            start_after = {'created': start_after['created'], '_id': str(start_after['_id'])}
+        self.start_after = start_after
+
     def to_dict(self):
         """
         :return:    the UnitAssociationCriteria as a dict, suitable for serialization by
@@ -196,7 +234,8 @@ class UnitAssociationCriteria(Model):
             'skip': self.skip,
             'association_fields': self.association_fields,
             'unit_fields': self.unit_fields,
-            'remove_duplicates': self.remove_duplicates
+            'remove_duplicates': self.remove_duplicates,
+            'start_after': self.start_after
         }
 
     @classmethod
@@ -219,7 +258,8 @@ class UnitAssociationCriteria(Model):
                    input_dictionary['unit_filters'], input_dictionary['association_sort'],
                    input_dictionary['unit_sort'], input_dictionary['limit'],
                    input_dictionary['skip'], input_dictionary['association_fields'],
-                   input_dictionary['unit_fields'], input_dictionary['remove_duplicates'])
+                   input_dictionary['unit_fields'], input_dictionary['remove_duplicates'],
+                   input_dictionary.get('start_after'))
 
     @classmethod
     def from_client_input(cls, query):
@@ -244,7 +284,11 @@ class UnitAssociationCriteria(Model):
             "unit" : ["name", "version", "arch"],
             "association" : ["created"]
           },
-          "remove_duplicates" : True
+          "remove_duplicates" : True,
+          "start_after" : {
+            "created" : "2016-01-01T00:00:00Z",
+            "_id" : "56a7b9f70bdfe02b5a8e0a69"
+          }
         }
 
         @param query: user-provided query details
@@ -288,6 +332,8 @@ class UnitAssociationCriteria(Model):
 
         remove_duplicates = bool(query.pop('remove_duplicates', False))
 
+        start_after = _validate_start_after(query.pop('start_after', None))
+
         # report any superfluous doc key, value pairs as errors
         for d in (query, filters, sort, fields):
             if d:
@@ -305,7 +351,7 @@ class UnitAssociationCriteria(Model):
                    unit_filters=unit_filters, association_sort=association_sort,
                    unit_sort=unit_sort, limit=limit, skip=skip,
                    association_fields=association_fields, unit_fields=unit_fields,
-                   remove_duplicates=remove_duplicates)
+                   remove_duplicates=remove_duplicates, start_after=start_after)
 
     @property
     def association_spec(self):
@@ -313,8 +359,28 @@ class UnitAssociationCriteria(Model):
             return None
         association_spec = copy.copy(self.association_filters)
         _compile_regexs_for_not(association_spec)
+        if self.start_after is not None:
+            association_spec = {'$and': [association_spec, self.start_after_spec]}
         return association_spec
 
+    @property
+    def start_after_spec(self):
+        """
+        Mongo spec that only matches the associations ordered after start_after
+        when ordered by created timestamp and id. This is answered by walking
+        the index, where a skip would have to step over every earlier association.
+
+        :rtype: dict or None
+        """
+        if self.start_after is None:
+            return None
+        created = self.start_after['created']
+        association_id = ObjectId(self.start_after['_id'])
+        return {'$or': [
+            {'created': {'$gt': created}},
+            {'created': created, '_id': {'$gt': association_id}}
+        ]}
+
     @property
     def unit_spec(self):
         if self.unit_filters is None:
@@ -343,6 +409,8 @@ class UnitAssociationCriteria(Model):
             s += 'Assoc Fields [%s] ' % self.association_fields
         if self.unit_fields:
             s += 'Unit Fields [%s] ' % self.unit_fields
+        if self.start_after:
+            s += 'Start After [%s] ' % self.start_after
         s += 'Remove Duplicates [%s]' % self.remove_duplicates
         return s
 
@@ -430,6 +498,29 @@ def _validate_fields(fields):
     return fields
 
 
+def _validate_start_after(start_after):
+    """
+    @type  start_after: dict
+
+    @rtype: dict
+    """
+    if start_after is None:
+        return None
+    try:
+        created = start_after['created']
+        if not isinstance(created, basestring):
+            raise TypeError('Invalid created timestamp [%s]' % str(created))
+        association_id = start_after['_id']
+        if isinstance(association_id, dict):
+            # Search results encode the association id as extended JSON: {"$oid": "..."}
+            association_id = association_id['$oid']
+        association_id = ObjectId(association_id)
+    except (TypeError, KeyError, InvalidId):
+        raise pulp_exceptions.InvalidValue(['start_after']), None, sys.exc_info()[2]
+    else:
+        return {'created': created, '_id': str(association_id)}
+
+
 def _compile_regexs_for_not(spec):
     """
     Compile the regular expression for the `$not` operator which is required by Mongo.
@@ -45,7 +45,9 @@ class RepoContentUnit(Model):
     # Make sure you understand how the order of these affects mongo before
     # modifying the following index
     unique_indices = (('repo_id', 'unit_type_id', 'unit_id'),)
-    search_indices = (('repo_id', 'unit_type_id'),
+    # get_units queries by repo and type, ordered by created; this also serves
+    # queries on repo and type alone
+    search_indices = (('repo_id', 'unit_type_id', 'created'),
                       # default sort order on get_units query, do not remove
                       ('unit_type_id', 'created'),
                       'unit_id')
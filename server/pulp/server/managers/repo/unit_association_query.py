@@ -6,6 +6,7 @@ import itertools
 import pymongo
 
 from pulp.plugins.types import database as types_db
+from pulp.plugins.util.misc import paginate
 from pulp.server.controllers import units
 from pulp.server.db.model.criteria import UnitAssociationCriteria
 from pulp.server.db.model.repository import RepoContentUnit
@@ -55,7 +56,9 @@ class RepoUnitAssociationQueryManager(object):
         :param criteria: if specified will drive the query
         :type  criteria: UnitAssociationCriteria
 
-        :param as_generator: if true, return a generator; if false, a list
+        :param as_generator: if true, return a generator; if false, a list. Callers
+                             that only iterate over the units once should ask for
+                             a generator, so the units are never all held in memory.
         :type  as_generator: bool
 
         :return: generator or list of units associated with the repo
@@ -64,25 +67,31 @@ class RepoUnitAssociationQueryManager(object):
 
         criteria = criteria or UnitAssociationCriteria()
 
-        unit_associations_generator = self._unit_associations_cursor(repo_id, criteria)
+        # If we're ordering by association fields, but not filtering the
+        # content units, then perform the skip and limit on the associations
+        # to limit the number of units we load into memory.
+        skip_and_limit_associations = criteria.association_sort and not criteria.unit_filters
+
+        unit_associations_cursor = self._unit_associations_cursor(repo_id, criteria)
+        unit_associations_generator = unit_associations_cursor
+
+        if skip_and_limit_associations:
+            # Removing duplicates never drops an association (see
+            # _unit_associations_no_duplicates), so the database can skip and
+            # limit in either case.
+            unit_associations_cursor.skip(criteria.skip or 0)
+            unit_associations_cursor.limit(criteria.limit or 0)
 
         if criteria.remove_duplicates:
             unit_associations_generator = self._unit_associations_no_duplicates(
                 criteria, unit_associations_generator)
 
-        if criteria.association_sort and not criteria.unit_filters:
-            # If we're ordering by association fields, but not filtering the
-            # content units, then perform the skip and limit on this generator
-            # to limit the number of units we load into memory.
-            # Manually perform skip and limit so we don't have to differentiate
-            # based on whether we're removing duplicates or not.
-            unit_associations_generator = self._with_skip_and_limit(unit_associations_generator,
-                                                                    criteria.skip, criteria.limit)
-
         # The unit ids are used for ordering the units when association field
         # ordering is specified (i.e. created timestamps, etc.)
-        # The ids are (unit_type_id, unit_id) tuples.
+        # The ids are (unit_type_id, unit_id) tuples. They are only collected
+        # when they will be used, as this holds an entry for every association.
         association_ordered_unit_ids = []
+        build_ordering = bool(criteria.association_sort)
 
         # The unit association information is part of the return values, so we
         # construct a lookup in order to retrieve that information when we are
@@ -100,26 +109,38 @@ class RepoUnitAssociationQueryManager(object):
             unit_id = association['unit_id']
 
             # Build the ordering.
-            association_ordered_unit_ids.append((unit_type_id, unit_id))
+            if build_ordering:
+                association_ordered_unit_ids.append((unit_type_id, unit_id))
 
             # Build the lookup.
             association_type_dict = associations_lookup.setdefault(unit_type_id, {})
-            association_list = association_type_dict.setdefault(unit_id, [])
-            association_list.append(association)
-
-        association_unit_types = criteria.type_ids or self.unit_type_ids_for_repo(repo_id)
+            if unit_id in association_type_dict:
+                association_type_dict[unit_id].append(association)
+            else:
+                association_type_dict[unit_id] = [association]
+
+        # The associations have already been filtered by type, so the lookup
+        # holds exactly the unit types that can produce results; there is no
+        # need to go back to the database for the repository's unit types.
         # The unit types should always be sorted in the same order, this allows
         # multiple calls with skip and limit to work across types.
-        association_unit_types = sorted(association_unit_types)
+        association_unit_types = sorted(associations_lookup)
+
+        if criteria.association_sort:
+            # The units are put in association order once they are retrieved,
+            # so they can be retrieved in pages of unit ids instead of with a
+            # single query that may hold hundreds of thousands of ids.
+            units_cursors = (self._associated_units_by_type_cursor(t, criteria, ids_page)
+                             for t in association_unit_types
+                             for ids_page in paginate(associations_lookup[t].keys()))
 
-        # Use a generator expression here to keep from going back to the types
-        # collections once we've returned our limit of results.
-        # Be sure to skip cursors that would otherwise return an empty result set.
-        units_cursors = (self._associated_units_by_type_cursor(t, criteria,
-                                                               associations_lookup[t].keys())
-                         for t in association_unit_types if t in associations_lookup)
+        else:
+            # Use a generator expression here to keep from going back to the types
+            # collections once we've returned our limit of results.
+            units_cursors = (self._associated_units_by_type_cursor(t, criteria,
+                                                                   associations_lookup[t].keys())
+                             for t in association_unit_types)
 
-        if not criteria.association_sort:
             # If we're not sorting based on association fields, then set the
             # skip and limit individually across the cursors to get consistent
             # behavior across multiple calls across multiple unit types.
@@ -128,7 +149,9 @@ class RepoUnitAssociationQueryManager(object):
             units_cursors = self._associated_units_cursors_with_skip(units_cursors, criteria.skip)
             units_cursors = self._associated_units_cursors_with_limit(units_cursors, criteria.limit)
 
-        units_generator = itertools.chain(*units_cursors)
+        # Chain the cursors lazily; unpacking the generator here would create
+        # (and count) every cursor up front, even those that are never reached.
+        units_generator = itertools.chain.from_iterable(units_cursors)
 
         if criteria.association_sort:
             # Use the ordered associations we created to properly order the results.
@@ -240,12 +263,31 @@ class RepoUnitAssociationQueryManager(object):
 
         collection = RepoContentUnit.get_collection()
 
-        cursor = collection.find({'repo_id': repo_id}, projection=['unit_type_id'])
-
-        return [t for t in cursor.distinct('unit_type_id')]
+        return collection.distinct('unit_type_id', {'repo_id': repo_id})
 
     # -- unit association methods ----------------------------------------------
 
+    @staticmethod
+    def _unit_associations_no_duplicates_sort(criteria):
+        """
+        Build the sort used when removing duplicate unit associations.
+
+        Sorting by the "created" flag is crucial to removing duplicate
+        associations, as the first association in that order is the one that
+        is kept. Unless the association sort already orders by "created", the
+        earliest association is kept.
+
+        :type criteria: UnitAssociationCriteria
+        :rtype: list
+        """
+
+        sort = list(criteria.association_sort or [])
+        # A field may only appear once in a sort; adding "created" again would
+        # silently replace the direction that was asked for.
+        if 'created' not in [field for field, direction in sort]:
+            sort.append(('created', SORT_ASCENDING))
+        return sort
+
     @staticmethod
     def _unit_associations_cursor(repo_id, criteria):
         """
@@ -263,6 +305,9 @@ class RepoUnitAssociationQueryManager(object):
         if criteria.type_ids:
             spec['unit_type_id'] = {'$in': criteria.type_ids}
 
+        if criteria.start_after is not None:
+            spec = {'$and': [spec, criteria.start_after_spec]}
+
         collection = RepoContentUnit.get_collection()
 
         cursor = collection.find(spec, projection=criteria.association_fields)
@@ -277,6 +322,11 @@ class RepoUnitAssociationQueryManager(object):
         """
         Remove duplicate unit associations from a iterator of unit associations.
 
+        The unique index on repo_id, unit_type_id and unit_id allows only one
+        association per unit in a repository, and every query is scoped to a
+        single repository, so no association is dropped in practice; this is
+        kept as a safeguard for the remove_duplicates contract.
+
         :type criteria: UnitAssociationCriteria
         :type cursor: pymongo.cursor.Cursor
         :rtype: generator
@@ -284,25 +334,29 @@ class RepoUnitAssociationQueryManager(object):
 
         # This algorithm returns the earliest association in the case of duplicates.
 
-        # Sorting by the "created" flag is crucial to removing duplicate associations.
-        created_sort_tuple = ('created', SORT_ASCENDING)
-        sort = criteria.association_sort or []
-        if created_sort_tuple not in sort:
-            sort.append(created_sort_tuple)
+        sort = RepoUnitAssociationQueryManager._unit_associations_no_duplicates_sort(criteria)
         cursor.sort(sort)
 
-        previously_generated_association_ids = set()
+        # The generated unit ids are tracked per unit type so that only the
+        # unit id strings are held, rather than a (type, id) tuple per unit.
+        # unit_type_id -> set(unit_id, ...)
+        previously_generated_unit_ids = {}
 
         for unit_association in cursor:
 
-            association_id = (unit_association['unit_type_id'], unit_association['unit_id'])
+            unit_type_id = unit_association['unit_type_id']
+            unit_id = unit_association['unit_id']
+
+            generated_unit_ids = previously_generated_unit_ids.get(unit_type_id)
+            if generated_unit_ids is None:
+                generated_unit_ids = previously_generated_unit_ids[unit_type_id] = set()
 
-            if association_id in previously_generated_association_ids:
+            elif unit_id in generated_unit_ids:
                 continue
 
             yield unit_association
 
-            previously_generated_association_ids.add(association_id)
+            generated_unit_ids.add(unit_id)
 
     @staticmethod
     def _with_skip_and_limit(iterator, skip, limit):
@@ -347,7 +401,7 @@ class RepoUnitAssociationQueryManager(object):
 
         :type unit_type_id: str
         :type criteria: UnitAssociationCriteria
-        :type associated_unit_ids: list
+        :type associated_unit_ids: list or tuple
         :rtype: pymongo.cursor.Cursor
         """
         collection = types_db.type_units_collection(unit_type_id)
@@ -462,6 +516,9 @@ class RepoUnitAssociationQueryManager(object):
         Return associated units in the order specified by the associated unit id
         list.
 
+        The unique index on repo_id, unit_type_id and unit_id means the unit ids
+        never repeat, so each unit is released as soon as it has been generated.
+
         :type associated_unit_ids: list
         :type associated_units: iterator
         :rtype: generator
@@ -480,10 +537,11 @@ class RepoUnitAssociationQueryManager(object):
         for id_tuple in associated_unit_ids:
             # the associated_unit_ids are sorted, but not all of the units may
             # be in the associated_units_by_id
-            if id_tuple not in associated_units_by_id:
+            unit = associated_units_by_id.pop(id_tuple, None)
+            if unit is None:
                 continue
 
-            yield associated_units_by_id[id_tuple]
+            yield unit
 
     @staticmethod
     def _merged_units_duplicate_units(associations_lookup, associated_units):
@@ -2,6 +2,7 @@
 This module contains tests for the pulp.server.async.tasks module.
 """
 from datetime import datetime
+import pickle
 import signal
 import unittest
 import uuid
@@ -277,6 +278,22 @@ class TestTaskResult(unittest.TestCase):
                                                             {'task_id': 'qux'},
                                                             {'task_id': 'quux'}])
 
+    def test_pickle(self):
+        """
+        Ensure a TaskResult survives the pickle round trip used by the result backend.
+        """
+        result = tasks.TaskResult('foo', spawned_tasks=['bar'])
+
+        unpickled = pickle.loads(pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+
+        self.assertEqual(unpickled.return_value, 'foo')
+        self.assertEqual(unpickled.error, None)
+        self.assertEqual(unpickled.spawned_tasks, [{'task_id': 'bar'}])
+
+    def test_no_arbitrary_attributes(self):
+        result = tasks.TaskResult()
+        self.assertRaises(AttributeError, setattr, result, 'foo', 'bar')
+
 
 class TestReservedTaskMixinApplyAsyncWithReservation(ResourceReservationTests):
 
@@ -571,6 +588,31 @@ class TestTaskOnFailureHandler(ResourceReservationTests):
         task.on_failure(exc, task_id, args, kwargs, einfo)
         self.assertFalse(mock_increment_failure.called)
 
+    @mock.patch('pulp.server.async.tasks._logger')
+    @mock.patch('pulp.server.async.tasks.Task.request')
+    def test_coded_exception_logs_einfo_traceback(self, mock_request, mock_logger):
+        """
+        Ensure the traceback already serialized by celery is logged for coded exceptions, rather
+        than formatting it again.
+        """
+        exc = PulpCodedException()
+        task_id = str(uuid.uuid4())
+
+        class EInfo(object):
+            """
+            on_failure handler expects an instance of celery's ExceptionInfo class
+            as one of the attributes. It stores string representation of traceback
+            in it's traceback instance variable. This is a stub to imitate that behavior.
+            """
+            def __init__(self):
+                self.traceback = "string_repr_of_traceback"
+
+        einfo = EInfo()
+        mock_request.called_directly = True
+        task = tasks.Task()
+        task.on_failure(exc, task_id, (), {}, einfo)
+        mock_logger.debug.assert_called_once_with("string_repr_of_traceback")
+
 
 class TestTaskApplyAsync(ResourceReservationTests):
 
@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+from mock import patch, MagicMock
+
+from pulp.server.db.migrate.models import MigrationModule
+
+MIGRATION = 'pulp.server.db.migrations.0029_drop_repo_content_unit_repo_type_index'
+
+
+class TestMigration(TestCase):
+    """
+    Test the migration.
+    """
+
+    @patch('.'.join((MIGRATION, 'connection')))
+    def test_migrate(self, mock_connection):
+        """
+        Test the index is dropped when it exists.
+        """
+        collection = MagicMock()
+        collection.index_information.return_value = {'repo_id_-1_unit_type_id_-1': {},
+                                                     'unit_id_-1': {}}
+        db = mock_connection.get_database.return_value
+        db.collection_names.return_value = ['repo_content_units']
+        db.__getitem__.return_value = collection
+
+        module = MigrationModule(MIGRATION)._module
+        module.migrate()
+
+        db.__getitem__.assert_called_once_with('repo_content_units')
+        collection.drop_index.assert_called_once_with('repo_id_-1_unit_type_id_-1')
+
+    @patch('.'.join((MIGRATION, 'connection')))
+    def test_migrate_no_index(self, mock_connection):
+        """
+        Test nothing is dropped when the index does not exist.
+        """
+        collection = MagicMock()
+        collection.index_information.return_value = {'unit_id_-1': {}}
+        db = mock_connection.get_database.return_value
+        db.collection_names.return_value = ['repo_content_units']
+        db.__getitem__.return_value = collection
+
+        module = MigrationModule(MIGRATION)._module
+        module.migrate()
+
+        self.assertFalse(collection.drop_index.called)
+
+    @patch('.'.join((MIGRATION, 'connection')))
+    def test_migrate_no_collection(self, mock_connection):
+        """
+        Test nothing is done when the collection does not exist.
+        """
+        db = mock_connection.get_database.return_value
+        db.collection_names.return_value = []
+
+        module = MigrationModule(MIGRATION)._module
+        module.migrate()
+
+        self.assertFalse(db.__getitem__.called)
@@ -8,6 +8,8 @@ import unittest
 
 from datetime import datetime
 
+from bson.objectid import ObjectId
+from kombu import serialization
 from mock import patch
 
 from pulp.server import exceptions
@@ -17,7 +19,7 @@ from pulp.server.db.model import criteria
 FIELDS = set(('sort', 'skip', 'limit', 'filters', 'fields'))
 ASSOCIATION_FIELDS = set(('type_ids', 'association_filters', 'unit_filters', 'association_sort',
                           'unit_sort', 'limit', 'skip', 'association_fields', 'unit_fields',
-                          'remove_duplicates'))
+                          'remove_duplicates', 'start_after'))
 
 
 class TestCriteria(unittest.TestCase):
@@ -297,6 +299,53 @@ class TestValidateFields(unittest.TestCase):
         self.assertRaises(exceptions.InvalidValue, criteria._validate_fields, input)
 
 
+class TestValidateStartAfter(unittest.TestCase):
+    def test_as_dict(self):
+        input = {'created': '2016-01-01T00:00:00Z', '_id': '56a7b9f70bdfe02b5a8e0a69'}
+        ret = criteria._validate_start_after(input)
+        self.assertEqual(ret, {'created': '2016-01-01T00:00:00Z',
+                               '_id': '56a7b9f70bdfe02b5a8e0a69'})
+
+    def test_as_extended_json(self):
+        input = {'created': '2016-01-01T00:00:00Z', '_id': {'$oid': '56a7b9f70bdfe02b5a8e0a69'}}
+        ret = criteria._validate_start_after(input)
+        self.assertEqual(ret, {'created': '2016-01-01T00:00:00Z',
+                               '_id': '56a7b9f70bdfe02b5a8e0a69'})
+
+    def test_invalid_extended_json(self):
+        self.assertRaises(exceptions.InvalidValue, criteria._validate_start_after,
+                          {'created': '2016-01-01T00:00:00Z', '_id': {'id': 'abc'}})
+
+    def test_as_object_id(self):
+        input = {'created': '2016-01-01T00:00:00Z', '_id': ObjectId('56a7b9f70bdfe02b5a8e0a69')}
+        ret = criteria._validate_start_after(input)
+        self.assertEqual(ret, {'created': '2016-01-01T00:00:00Z',
+                               '_id': '56a7b9f70bdfe02b5a8e0a69'})
+
+    def test_as_none(self):
+        ret = criteria._validate_start_after(None)
+        self.assertTrue(ret is None)
+
+    def test_missing_created(self):
+        self.assertRaises(exceptions.InvalidValue, criteria._validate_start_after,
+                          {'_id': '56a7b9f70bdfe02b5a8e0a69'})
+
+    def test_missing_id(self):
+        self.assertRaises(exceptions.InvalidValue, criteria._validate_start_after,
+                          {'created': '2016-01-01T00:00:00Z'})
+
+    def test_invalid_id(self):
+        self.assertRaises(exceptions.InvalidValue, criteria._validate_start_after,
+                          {'created': '2016-01-01T00:00:00Z', '_id': 'abc 123'})
+
+    def test_created_as_int(self):
+        self.assertRaises(exceptions.InvalidValue, criteria._validate_start_after,
+                          {'created': 123, '_id': '56a7b9f70bdfe02b5a8e0a69'})
+
+    def test_as_list(self):
+        self.assertRaises(exceptions.InvalidValue, criteria._validate_start_after, [])
+
+
 class TestConvertionsForNot(unittest.TestCase):
     """
     Test that regular expressions for the Mongo operator `$not` are converted to a proper format.
@@ -424,3 +473,65 @@ class TestUnitAssociationCriteria(unittest.TestCase):
         self.assertEqual(new_criteria.remove_duplicates, remove_duplicates)
         self.assertEqual(new_criteria.unit_sort, unit_sort)
         self.assertEqual(new_criteria.association_filters, association_filters)
+
+    def test_start_after_default_sort(self):
+        start_after = {'created': '2016-01-01T00:00:00Z', '_id': '56a7b9f70bdfe02b5a8e0a69'}
+        c = criteria.UnitAssociationCriteria(start_after=start_after)
+        self.assertEqual(c.association_sort, [('created', 1), ('_id', 1)])
+
+    def test_start_after_matching_sort(self):
+        start_after = {'created': '2016-01-01T00:00:00Z', '_id': '56a7b9f70bdfe02b5a8e0a69'}
+        c = criteria.UnitAssociationCriteria.from_client_input(
+            {'sort': {'association': [['created', 'ascending'], ['_id', 'ascending']]},
+             'start_after': start_after})
+        self.assertEqual(c.association_sort, [('created', 1), ('_id', 1)])
+
+    def test_start_after_other_sort(self):
+        start_after = {'created': '2016-01-01T00:00:00Z', '_id': '56a7b9f70bdfe02b5a8e0a69'}
+        self.assertRaises(exceptions.InvalidValue,
+                          criteria.UnitAssociationCriteria.from_client_input,
+                          {'sort': {'association': [['updated', 'descending']]},
+                           'start_after': start_after})
+
+    def test_start_after_descending_sort(self):
+        start_after = {'created': '2016-01-01T00:00:00Z', '_id': '56a7b9f70bdfe02b5a8e0a69'}
+        self.assertRaises(exceptions.InvalidValue, criteria.UnitAssociationCriteria,
+                          association_sort=[('created', -1), ('_id', -1)],
+                          start_after=start_after)
+
+    def test_association_spec_start_after(self):
+        start_after = {'created': '2016-01-01T00:00:00Z', '_id': '56a7b9f70bdfe02b5a8e0a69'}
+        c = criteria.UnitAssociationCriteria(association_filters={'updated': 'foo'},
+                                             start_after=start_after)
+
+        expected_start_after_spec = {'$or': [
+            {'created': {'$gt': '2016-01-01T00:00:00Z'}},
+            {'created': '2016-01-01T00:00:00Z',
+             '_id': {'$gt': ObjectId('56a7b9f70bdfe02b5a8e0a69')}}
+        ]}
+        self.assertEqual(c.start_after_spec, expected_start_after_spec)
+        self.assertEqual(c.association_spec,
+                         {'$and': [{'updated': 'foo'}, expected_start_after_spec]})
+
+    def test_association_spec_no_start_after(self):
+        c = criteria.UnitAssociationCriteria(association_filters={'updated': 'foo'})
+        self.assertTrue(c.start_after_spec is None)
+        self.assertEqual(c.association_spec, {'updated': 'foo'})
+
+    def test_start_after_json_round_trip(self):
+        """
+        Ensure criteria with start_after can be sent as a task argument, which is JSON serialized.
+        """
+        start_after = {'created': '2016-01-01T00:00:00Z',
+                       '_id': ObjectId('56a7b9f70bdfe02b5a8e0a69')}
+        c = criteria.UnitAssociationCriteria(type_ids=['rpm'], start_after=start_after)
+
+        content_type, content_encoding, data = serialization.dumps({'criteria': c.to_dict()},
+                                                                   serializer='json')
+        loaded = serialization.loads(data, content_type, content_encoding)
+        new_criteria = criteria.UnitAssociationCriteria.from_dict(loaded['criteria'])
+
+        self.assertEqual(new_criteria.start_after, {'created': '2016-01-01T00:00:00Z',
+                                                    '_id': '56a7b9f70bdfe02b5a8e0a69'})
+        self.assertEqual([tuple(s) for s in new_criteria.association_sort],
+                         c.association_sort)
@@ -58,6 +58,20 @@ class TestUnitsFromCriteria(unittest.TestCase):
                 break
         self.assertTrue(found)
 
+    def test_start_after(self, mock_find):
+        """
+        Ensure that only the associations after start_after are found.
+        """
+        start_after = {'created': '2016-01-01T00:00:00Z', '_id': '56a7b9f70bdfe02b5a8e0a69'}
+        criteria = UnitAssociationCriteria(type_ids=['foo'], start_after=start_after)
+
+        self.manager._units_from_criteria(self.repo, criteria)
+
+        association_q_combination = mock_find.call_args[1]['repo_content_unit_q']
+        raw_queries = [association_q.query.get('__raw__')
+                       for association_q in association_q_combination.children]
+        self.assertTrue(criteria.association_spec in raw_queries)
+
 
 @mock.patch('pulp.server.managers.repo.unit_association.model.Repository')
 class RepoUnitAssociationManagerTests(base.PulpServerTests):
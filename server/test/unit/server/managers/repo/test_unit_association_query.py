@@ -73,6 +73,59 @@ class RepoUnitAssociationQueryManagerTests(unittest.TestCase):
         ]
         self.assertEqual(return_value, expected_return_value)
 
+    def test__association_ordered_units(self):
+        associated_unit_ids = [('rpm', 'b'), ('rpm', 'missing'), ('rpm', 'a')]
+        associated_units = [
+            {'_content_type_id': 'rpm', '_id': 'a'},
+            {'_content_type_id': 'rpm', '_id': 'b'},
+        ]
+
+        return_value = list(
+            association_query_manager.RepoUnitAssociationQueryManager._association_ordered_units(
+                associated_unit_ids, associated_units))
+
+        self.assertEqual([u['_id'] for u in return_value], ['b', 'a'])
+
+    def test__unit_associations_no_duplicates_sort(self):
+        criteria = UnitAssociationCriteria(remove_duplicates=True)
+
+        manager = association_query_manager.RepoUnitAssociationQueryManager
+        sort = manager._unit_associations_no_duplicates_sort(criteria)
+
+        self.assertEqual(sort, [('created', association_query_manager.SORT_ASCENDING)])
+
+    def test__unit_associations_no_duplicates_sort_created_descending(self):
+        association_sort = [('updated', association_query_manager.SORT_ASCENDING),
+                            ('created', association_query_manager.SORT_DESCENDING)]
+        criteria = UnitAssociationCriteria(association_sort=list(association_sort),
+                                           remove_duplicates=True)
+
+        manager = association_query_manager.RepoUnitAssociationQueryManager
+        sort = manager._unit_associations_no_duplicates_sort(criteria)
+
+        self.assertEqual(sort, association_sort)
+        # the criteria must not be altered
+        self.assertEqual(criteria.association_sort, association_sort)
+
+    @mock.patch.object(association_query_manager.RepoUnitAssociationQueryManager,
+                       '_unit_associations_cursor')
+    def test_get_units_remove_duplicates_skip_and_limit_associations(self, mock_cursor):
+        """
+        Ensure skip and limit are performed by the database when removing duplicates.
+        """
+        cursor = mock_cursor.return_value
+        cursor.__iter__.return_value = iter([])
+        criteria = UnitAssociationCriteria(
+            association_sort=[('created', association_query_manager.SORT_ASCENDING)],
+            skip=2, limit=3, remove_duplicates=True)
+
+        manager = association_query_manager.RepoUnitAssociationQueryManager()
+        units = manager.get_units('repo-1', criteria)
+
+        self.assertEqual(units, [])
+        cursor.skip.assert_called_once_with(2)
+        cursor.limit.assert_called_once_with(3)
+
 
 class UnitAssociationQueryTests(base.PulpServerTests):
 
@@ -339,6 +392,36 @@ class UnitAssociationQueryTests(base.PulpServerTests):
         gamma_units = [u for u in units if u['unit_type_id'] == 'gamma']
         self.assertEqual(2, len(gamma_units))
 
+    def test_get_units_remove_duplicates_with_fields(self):
+        # Test
+        criteria = UnitAssociationCriteria(association_fields=['created'], remove_duplicates=True)
+        units = self.manager.get_units_across_types('repo-1', criteria)
+
+        # Verify
+        self.assertEqual(self.repo_1_count, len(units))
+        for u in units:
+            self.assertTrue('unit_id' in u)
+            self.assertTrue('created' in u)
+            self.assertFalse('updated' in u)
+
+    def test_get_units_start_after(self):
+        # Test
+        first_criteria = UnitAssociationCriteria(
+            type_ids=['beta'], limit=2,
+            association_sort=[('created', association_manager.SORT_ASCENDING),
+                              ('_id', association_manager.SORT_ASCENDING)])
+        first_page = self.manager.get_units('repo-1', first_criteria)
+
+        last = first_page[-1]
+        start_after = {'created': last['created'], '_id': last['_id']}
+        next_criteria = UnitAssociationCriteria(type_ids=['beta'], limit=2,
+                                                start_after=start_after)
+        next_page = self.manager.get_units('repo-1', next_criteria)
+
+        # Verify
+        self.assertEqual(self.units['beta'][:2], [u['unit_id'] for u in first_page])
+        self.assertEqual(self.units['beta'][2:], [u['unit_id'] for u in next_page])
+
     def test_get_units_with_fields(self):
         # Test
         criteria = UnitAssociationCriteria(association_fields=['created'])
@@ -424,6 +507,17 @@ class UnitAssociationQueryTests(base.PulpServerTests):
             u2 = units[i + 1]
             self.assertTrue(u1['updated'] >= u2['updated'])
 
+    def test_get_units_by_type_association_sort_skip_limit_remove_duplicates(self):
+        # Test
+        criteria = UnitAssociationCriteria(
+            association_sort=[('created', association_manager.SORT_ASCENDING)], skip=1, limit=1,
+            remove_duplicates=True)
+        units = self.manager.get_units_by_type('repo-1', 'beta', criteria)
+
+        # Verify
+        self.assertEqual(1, len(units))
+        self.assertEqual(self.units['beta'][1], units[0]['unit_id'])
+
     def test_get_units_by_type_unit_metadata_sort_limit(self):
         # Test
         criteria = UnitAssociationCriteria(
@@ -472,6 +566,20 @@ class UnitAssociationQueryTests(base.PulpServerTests):
             u2 = sort_units[i + 1]
             self.assertTrue(u1['created'] >= u2['created'])
 
+    @mock.patch('pulp.server.managers.repo.unit_association_query.paginate')
+    def test_get_units_by_type_sort_association_data_paginated(self, mock_paginate):
+        mock_paginate.side_effect = lambda ids: ((unit_id,) for unit_id in ids)
+
+        # Test
+        sort_criteria = UnitAssociationCriteria(
+            association_sort=[('created', association_manager.SORT_DESCENDING)])
+        sort_units = self.manager.get_units_by_type('repo-1', 'beta', sort_criteria)
+
+        # Verify
+        self.assertEqual(list(reversed(self.units['beta'])), [u['unit_id'] for u in sort_units])
+        for u in sort_units:
+            self._assert_unit_integrity(u)
+
     def test_get_units_by_type_sort_unit_data(self):
         # Test
         sort_criteria = UnitAssociationCriteria(
@@ -1,6 +1,7 @@
 from operator import itemgetter
 import json
 
+from bson.objectid import ObjectId
 from django import http
 import mock
 
@@ -707,6 +708,32 @@ class TestRepoUnitSearch(unittest.TestCase):
         mock_uqm().get_units.assert_called_once_with('mock_repo', criteria=criteria)
         mock_resp.assert_called_once_with(mock_uqm().get_units.return_value)
 
+    @mock.patch('pulp.server.webservices.views.repositories.content')
+    @mock.patch('pulp.server.webservices.views.repositories.manager_factory.'
+                'repo_unit_association_query_manager')
+    @mock.patch('pulp.server.webservices.views.repositories.model.Repository.objects')
+    def test__generate_response_start_after_round_trip(self, mock_repo_qs, mock_uqm,
+                                                       mock_content):
+        """
+        Test that the last association of a page of results can be used to request the next page.
+        """
+        association = {'_id': ObjectId('522777f5e19a002faebebf79'),
+                       'created': '2013-09-04T22:12:05Z', 'unit_type_id': 'rpm',
+                       'metadata': {'_id': 'unit_1'}}
+        mock_uqm().get_units.return_value = [association]
+        repo_unit_search = RepoUnitSearch()
+
+        response = repo_unit_search._generate_response({}, {}, repo_id='mock_repo')
+
+        last = json.loads(response.content)[-1]
+        query = {'type_ids': ['rpm', 'srpm'],
+                 'start_after': {'created': last['created'], '_id': last['_id']}}
+        repo_unit_search._generate_response(query, {}, repo_id='mock_repo')
+
+        criteria = mock_uqm().get_units.call_args[1]['criteria']
+        self.assertEqual(criteria.start_after, {'created': '2013-09-04T22:12:05Z',
+                                                '_id': '522777f5e19a002faebebf79'})
+
 
 class TestRepoImportersView(unittest.TestCase):
     """